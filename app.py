@@ -1,7 +1,13 @@
 import os
+import gzip
+import time
+import hashlib
+import threading
 from dotenv import load_dotenv
 from flask import Flask, render_template, request, jsonify
 from tools import PerplexitySearchTool
+from renderer import attach_rendered_html
+from findings import extract_findings
 
 # Try to import CrewAI - will fail on Python 3.9
 try:
@@ -13,6 +19,13 @@ except (ImportError, TypeError) as e:
     CREWAI_AVAILABLE = False
     run_search_crew = None
 
+# Brotli is optional - gzip is used when it's not installed
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
@@ -21,32 +34,149 @@ app = Flask(__name__)
 # Initialize the search tool
 search_tool = PerplexitySearchTool()
 
+# Finished searches, so repeated polls don't re-run Perplexity/CrewAI
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', '600'))  # seconds
+RESULT_CACHE_SIZE = 128
+result_cache = {}
+result_cache_lock = threading.Lock()
+
+# Responses smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 500
+
+
+def _get_cached_result(cache_key):
+    """Return a cached response payload, or None if missing or expired"""
+    with result_cache_lock:
+        entry = result_cache.get(cache_key)
+        if entry is None:
+            return None
+        cached_at, response_data = entry
+        if time.time() - cached_at > RESULT_CACHE_TTL:
+            result_cache.pop(cache_key, None)
+            return None
+        return response_data
+
+
+def _cache_result(cache_key, response_data):
+    """Store a response payload, evicting the oldest entry when full"""
+    with result_cache_lock:
+        result_cache.pop(cache_key, None)
+        if len(result_cache) >= RESULT_CACHE_SIZE:
+            result_cache.pop(next(iter(result_cache)), None)
+        result_cache[cache_key] = (time.time(), response_data)
+
+
+def _compact_result(response_data):
+    """Reduce a full response to content, citations, usage and findings"""
+    perplexity_result = response_data["perplexity_result"]
+    compact = {"mode": response_data["mode"]}
+    if response_data["mode"] in ['crewai', 'both']:
+        compact["crewai_result"] = response_data["crewai_result"]
+    if "error" in perplexity_result:
+        compact["error"] = perplexity_result["error"]
+    if "choices" in perplexity_result and len(perplexity_result["choices"]) > 0:
+        content = perplexity_result["choices"][0]["message"]["content"]
+        compact["content"] = content
+        compact["citations"] = perplexity_result.get("citations", [])
+        compact["usage"] = perplexity_result.get("usage", {})
+        compact["findings"] = extract_findings(content)
+    return compact
+
+
+def _format_result(response_data, response_format, fields):
+    """Apply the requested format and keep only the comma-separated fields asked for"""
+    payload = _compact_result(response_data) if response_format == 'compact' else response_data
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    if not selected:
+        return payload
+    return {key: value for key, value in payload.items() if key in selected}
+
+
+def _make_search_response(payload, with_etag=False, from_cache=False):
+    """Serialize the payload with ETag and Accept-Encoding negotiation
+
+    Args:
+        payload: Response data to send as JSON
+        with_etag: Whether to tag the response (cacheable GET polls only)
+        from_cache: Whether the payload came from the result cache, the only
+            case where If-None-Match is evaluated and may yield a 304
+    """
+    body = app.json.dumps(payload).encode('utf-8')
+    response = app.response_class(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+
+    if with_etag:
+        # Weak ETag: the same JSON may be sent with different encodings
+        response.set_etag(hashlib.sha256(body).hexdigest()[:32], weak=True)
+        etag, _ = response.get_etag()
+        if from_cache and request.if_none_match.contains_weak(etag):
+            response.status_code = 304
+            response.set_data(b'')
+            return response
+
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encodings = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding == 'br':
+            response.set_data(brotli.compress(body))
+            response.headers['Content-Encoding'] = 'br'
+        elif encoding == 'gzip':
+            response.set_data(gzip.compress(body))
+            response.headers['Content-Encoding'] = 'gzip'
+
+    return response
+
+
 # Routes
 @app.route('/')
 def home():
     return render_template('index.html')
 
-@app.route('/search', methods=['POST'])
+@app.route('/search', methods=['GET', 'POST'])
 def search():
-    query = request.form.get('query', '').strip()
-    mode = request.form.get('mode', 'crewai')  # crewai, both, or perplexity
-    perplexity_key = request.form.get('perplexity_key', '').strip()  # Optional custom API key
+    # GET is for polling integrations: everything comes from the URL and the
+    # server's own API key is used, so customer keys never end up in URLs
+    polling = request.method == 'GET'
+    if polling:
+        if 'perplexity_key' in request.args:
+            return jsonify({"error": "perplexity_key must be sent in a POST body"}), 400
+        params = request.args
+        perplexity_key = ''
+    else:
+        params = request.form
+        perplexity_key = request.form.get('perplexity_key', '').strip()  # Optional custom API key
+    query = params.get('query', '').strip()
+    mode = params.get('mode', 'crewai')  # crewai, both, or perplexity
+    response_format = request.values.get('format', 'full')  # full or compact
+    fields = request.values.get('fields', '')  # Optional comma-separated field list
     
     if not query:
         return jsonify({"error": "Query cannot be empty"}), 400
+    if response_format not in ['full', 'compact']:
+        return jsonify({"error": "Format must be 'full' or 'compact'"}), 400
     
     try:
+        # Serve repeated polls from the cache instead of searching again
+        cache_key = (query, mode, hashlib.sha256(perplexity_key.encode('utf-8')).hexdigest())
+        response_data = _get_cached_result(cache_key) if polling else None
+        if response_data is not None:
+            print(f"Serving cached result for: {query}")
+            payload = _format_result(response_data, response_format, fields)
+            return _make_search_response(payload, with_etag=True, from_cache=True)
+        
         print(f"Searching for: {query}")
         print(f"Mode: {mode}")
         
         crewai_result = None
         perplexity_result = None
+        cacheable = True  # Failed searches are not cached
         
         # Handle different modes
         if mode in ['crewai', 'both']:
             # Run CrewAI
             if not CREWAI_AVAILABLE:
                 crewai_result = "⚠️ CrewAI is not available. Requires Python 3.10+. Please use Perplexity Only mode or upgrade Python."
+                cacheable = False
             else:
                 try:
                     print("Running CrewAI analysis...")
@@ -56,6 +186,7 @@ def search():
                 except Exception as crew_error:
                     print(f"CrewAI error: {str(crew_error)}")
                     crewai_result = f"CrewAI analysis failed: {str(crew_error)}"
+                    cacheable = False
         
         if mode in ['perplexity', 'both']:
             # Run Perplexity search with optional custom API key
@@ -72,8 +203,12 @@ def search():
             # Check for errors
             if "error" in perplexity_result:
                 print(f"Error in perplexity result: {perplexity_result['error']}")
+                cacheable = False
                 if mode == 'perplexity':  # Only return error if perplexity-only mode
                     return jsonify({"error": perplexity_result["error"]}), 500
+            else:
+                # Render the report once so the UI doesn't have to
+                attach_rendered_html(perplexity_result)
         
         # Set default messages if not run
         if crewai_result is None:
@@ -86,8 +221,11 @@ def search():
             "perplexity_result": perplexity_result,
             "mode": mode
         }
-        print(f"Sending response with mode: {mode}")
-        return jsonify(response_data)
+        if cacheable:
+            _cache_result(cache_key, response_data)
+        print(f"Sending response with mode: {mode}, format: {response_format}")
+        payload = _format_result(response_data, response_format, fields)
+        return _make_search_response(payload, with_etag=polling and cacheable)
     except Exception as e:
         print(f"Exception occurred: {str(e)}")
         import traceback
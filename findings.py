@@ -0,0 +1,68 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from renderer import TABLE_SEPARATOR_PATTERN
+
+
+# Matches the "Name: [Entity/Person]" line that opens each entity section
+NAME_PATTERN = re.compile(r'^[#*\s]*Name[*\s]*:[*\s]*(.+?)[*\s]*$', re.IGNORECASE)
+
+# Matches a cell delimiter, i.e. a pipe that isn't escaped as \|
+CELL_DELIMITER_PATTERN = re.compile(r'(?<!\\)\|')
+
+
+def _table_cells(line: str) -> List[str]:
+    """Split a markdown table row into stripped cell values"""
+    cells = CELL_DELIMITER_PATTERN.split(line.strip())
+    # Drop the empty cells outside the leading and trailing pipes
+    if cells and not cells[0].strip():
+        cells = cells[1:]
+    if cells and not cells[-1].strip():
+        cells = cells[:-1]
+    return [cell.strip().replace('\\|', '|') for cell in cells]
+
+
+def _field_name(header: str) -> str:
+    """Turn a table header like 'Findings (Yes/No)' into 'findings'"""
+    header = re.sub(r'\(.*?\)', '', header)
+    return re.sub(r'[^a-z0-9]+', '_', header.lower()).strip('_')
+
+
+@lru_cache(maxsize=128)
+def _extract_findings(content: str) -> Tuple[Tuple[Tuple[str, str], ...], ...]:
+    findings = []
+    name = None
+    headers = None
+    for line in content.splitlines():
+        stripped = line.strip()
+        if not stripped.startswith('|'):
+            headers = None
+            match = NAME_PATTERN.match(stripped)
+            if match:
+                name = match.group(1)
+            continue
+        if TABLE_SEPARATOR_PATTERN.match(stripped):
+            continue
+        cells = _table_cells(stripped)
+        if headers is None:
+            headers = [_field_name(cell) for cell in cells]
+            continue
+        if 'risk_category' not in headers:
+            continue
+        row = [('name', name)] if name else []
+        row.extend(zip(headers, cells))
+        findings.append(tuple(row))
+    return tuple(findings)
+
+
+def extract_findings(content: str) -> List[Dict[str, str]]:
+    """Pull the rows of the report's Findings Tables out as structured data
+
+    Args:
+        content: Report text in markdown
+
+    Returns:
+        One dict per table row, keyed by the table headers (e.g. 'risk_category',
+        'findings', 'details', 'source_link') plus the entity 'name' if known
+    """
+    return [dict(row) for row in _extract_findings(content)]
@@ -0,0 +1,185 @@
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+from xml.etree import ElementTree as etree
+import markdown
+from markdown.treeprocessors import Treeprocessor
+
+
+# Matches bracketed citation markers like [1], [12] and bare http(s) URLs,
+# leaving trailing punctuation and markdown escape placeholders out of the URL
+LINKABLE_PATTERN = re.compile(
+    r'\[(?P<citation>\d+)\]'
+    r'|(?P<url>https?://[^\s<>"\[\]\x02\x03]*[^\s<>"\[\]\x02\x03.,;:!?\'()])'
+)
+
+# Matches markdown table separator rows like |---|:---:|
+TABLE_SEPARATOR_PATTERN = re.compile(r'^\|?[\s:|-]+\|?$')
+
+# Matches the opening/closing line of a fenced code block
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+
+SAFE_URL_SCHEMES = ('http://', 'https://', 'mailto:')
+
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code', 'sane_lists', 'nl2br']
+
+# Elements whose text must never be turned into links
+LINK_SKIP_TAGS = ('a', 'code', 'pre')
+
+
+def _is_safe_url(url: str) -> bool:
+    """Only allow links to web pages and email addresses"""
+    return url.strip().lower().startswith(SAFE_URL_SCHEMES)
+
+
+def _is_table_separator(line: str) -> bool:
+    """Check whether a line is a table separator row like |---|---|"""
+    return '|' in line and '-' in line and bool(TABLE_SEPARATOR_PATTERN.match(line))
+
+
+def _separate_tables(content: str) -> str:
+    """Put a blank line before tables that directly follow a paragraph line
+
+    The report prompt asks for "Findings Table:" with the table header on the
+    very next line. GFM renders that as a table, but Python-Markdown only
+    builds tables that are their own block.
+    """
+    lines = content.splitlines()
+    separated = []
+    in_fence = False
+    for idx, line in enumerate(lines):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif (not in_fence
+              and line.strip().startswith('|')
+              and idx + 1 < len(lines)
+              and _is_table_separator(lines[idx + 1].strip())
+              and separated
+              and separated[-1].strip()
+              and not separated[-1].strip().startswith('|')):
+            separated.append('')
+        separated.append(line)
+    return '\n'.join(separated)
+
+
+class ReportTreeprocessor(Treeprocessor):
+    """Link citation markers and bare URLs in text and make every link safe to open"""
+
+    def __init__(self, md: markdown.Markdown, citations: Tuple[str, ...]):
+        super().__init__(md)
+        self.citations = citations
+
+    def run(self, root: etree.Element) -> None:
+        self._link_text(root)
+        for link in root.iter('a'):
+            if not _is_safe_url(link.get('href', '')):
+                link.set('href', '#')
+            link.set('target', '_blank')
+            link.set('rel', 'noopener noreferrer')
+
+    def _citation_link(self, idx: int) -> etree.Element:
+        link = etree.Element('a')
+        link.set('href', self.citations[idx - 1])
+        link.set('class', 'text-blue-600 hover:text-blue-800 font-semibold')
+        link.text = str(idx)
+        return link
+
+    def _url_link(self, url: str) -> etree.Element:
+        link = etree.Element('a')
+        link.set('href', url)
+        link.text = url
+        return link
+
+    def _split_links(self, text: str) -> Tuple[str, List[etree.Element]]:
+        """Split text into leading text and citation/URL links, each carrying
+        the text that follows it as its tail"""
+        if not text:
+            return text, []
+        head = None
+        links = []
+        last = 0
+        for match in LINKABLE_PATTERN.finditer(text):
+            if match.group('url'):
+                group = 'url'
+                link = self._url_link(match.group('url'))
+            else:
+                idx = int(match.group('citation'))
+                if idx < 1 or idx > len(self.citations) or not _is_safe_url(self.citations[idx - 1]):
+                    continue
+                # Keep the brackets as text around the link: [<a>1</a>]
+                group = 'citation'
+                link = self._citation_link(idx)
+            preceding = text[last:match.start(group)]
+            if links:
+                links[-1].tail = preceding
+            else:
+                head = preceding
+            links.append(link)
+            last = match.end(group)
+        if not links:
+            return text, []
+        links[-1].tail = text[last:]
+        return head, links
+
+    def _link_text(self, parent: etree.Element) -> None:
+        """Rewrite citation markers and bare URLs in text nodes, skipping
+        links and code"""
+        if parent.tag in LINK_SKIP_TAGS:
+            return
+        children = list(parent)
+        parent.text, links = self._split_links(parent.text)
+        for offset, link in enumerate(links):
+            parent.insert(offset, link)
+        for child in children:
+            self._link_text(child)
+            child.tail, links = self._split_links(child.tail)
+            position = list(parent).index(child) + 1
+            for offset, link in enumerate(links):
+                parent.insert(position + offset, link)
+
+
+@lru_cache(maxsize=128)
+def render_report(content: str, citations: Tuple[str, ...] = ()) -> str:
+    """Convert report markdown to sanitized HTML with linked citations
+
+    Raw HTML and images in the report are not rendered, and links that
+    aren't http(s)/mailto are neutralized, so only safe markup produced by
+    the markdown renderer ends up in the output. Citation markers and bare
+    http(s) URLs are linked in a single pass over the text, outside of
+    links and code.
+
+    Args:
+        content: Report text in markdown
+        citations: Citation URLs, where citations[0] belongs to marker [1]
+
+    Returns:
+        HTML string safe to inject into the page
+    """
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    # Treat raw HTML and images as plain text instead of passing them through
+    md.preprocessors.deregister('html_block')
+    md.inlinePatterns.deregister('html')
+    md.inlinePatterns.deregister('image_link')
+    md.inlinePatterns.deregister('image_reference')
+    md.inlinePatterns.deregister('short_image_ref')
+    # Run after inline patterns, before escaped characters are restored
+    md.treeprocessors.register(ReportTreeprocessor(md, citations), 'report', 5)
+    return md.convert(_separate_tables(content))
+
+
+def attach_rendered_html(perplexity_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Render the report once and store it on the result as 'rendered_html'
+
+    Args:
+        perplexity_result: Raw Perplexity API response
+
+    Returns:
+        The same result dict, with 'rendered_html' added when it has content
+    """
+    if "rendered_html" in perplexity_result:
+        return perplexity_result
+    if "choices" in perplexity_result and len(perplexity_result["choices"]) > 0:
+        content = perplexity_result["choices"][0]["message"]["content"]
+        citations = tuple(perplexity_result.get("citations") or ())
+        perplexity_result["rendered_html"] = render_report(content, citations)
+    return perplexity_result
@@ -2,6 +2,7 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 from tools import PerplexitySearchTool
+from renderer import attach_rendered_html
 
 # Try to import CrewAI
 try:
@@ -143,22 +144,9 @@ if st.button("🚀 Search", type="primary", use_container_width=True):
                     if "error" in perplexity_result:
                         st.error(f"❌ Error: {perplexity_result['error']}")
                     elif "choices" in perplexity_result and len(perplexity_result["choices"]) > 0:
-                        message = perplexity_result["choices"][0]["message"]
-                        content = message["content"]
-                        
-                        # Process citations to make bracketed numbers clickable
-                        if "citations" in perplexity_result and perplexity_result["citations"]:
-                            citations = perplexity_result["citations"]
-                            # Replace [1], [2], etc. with clickable links
-                            import re
-                            for idx, url in enumerate(citations, 1):
-                                # Match [number] pattern
-                                pattern = rf'\[{idx}\]'
-                                replacement = f'[[{idx}]]({url})'
-                                content = re.sub(pattern, replacement, content)
-                        
-                        # Display the content with clickable citations
-                        st.markdown(content, unsafe_allow_html=True)
+                        # Display the pre-rendered report as-is, without parsing it as markdown again
+                        attach_rendered_html(perplexity_result)
+                        st.html(perplexity_result["rendered_html"])
                         
                         # Display metadata in expander
                         with st.expander("ℹ️ Response Metadata"):